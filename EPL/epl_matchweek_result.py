@@ -5,18 +5,25 @@ and writes the data to a CSV file. It utilizes web scraping techniques to extrac
 
 Modules:
 - argparse: For parsing command-line arguments.
-- csv: For writing match statistics to a CSV file.
-- urllib.request: For sending HTTP requests and handling responses.
-- bs4(BeautifulSoup): For parsing HTML content.
+- orjson: For parsing the stats API JSON, falling back to the standard json module.
+- asyncio/aiohttp: For sending the HTTP requests of all matches concurrently over pooled
+    keep-alive connections.
+- selectolax: For parsing HTML content, falling back to lxml.
 - fake_useragent: For generating random user agents for HTTP requests.
 
-Classes:
-- MatchStatistic: A class (imported from EPL.epl_match_result) used to process and store
-    match statistics.
+Functions imported from EPL.epl_match_result:
+- build_row(data: dict, ref: str): Flattens a match statistics payload into its CSV row.
 
 Functions:
-- manipulate_stats(data: MatchStatistic, ref: str): Processes match statistics data and
-    extracts relevant information into a list format.
+- fetch(session, url, headers=None): Returns the body of a GET request.
+- load_match_info(href: str, api_session): Returns the stats API payload of a match,
+    cached on disk once the match is completed.
+- process_match(href: str, site_session, api_session): Fetches the referee and statistics
+    of a single match and returns its CSV row.
+- get_html_parser() / get_lxml_tools() / get_ua_pool(): Import the HTML parsers and sample
+    the user agent pool on first use.
+- parse_fixture_hrefs(html: bytes): Extracts the match paths from a match week page.
+- parse_referee(html: bytes): Extracts the referee's name from a match page.
 - main(match_week: int): Fetches match statistics for a given match week, processes the
     data, and writes it to a CSV file.
 
@@ -29,16 +36,16 @@ CSV Output:
     - Season, Date, HomeTeam, AwayTeam, FTHG, FTAG, HTHG, HTAG, Referee, HS, AS, HST, AST, HC,
         AC, HF, AF, HY, AY, HR, AR.
 
-- The script requires the `fake_useragent` and `bs4` libraries to be installed.
-- It assumes the existence of the `MatchStatistic` class and its `get_stats` method for
-    processing match data.
+- The script requires the `fake_useragent`, `aiohttp` and `selectolax` (or `lxml`)
+    libraries to be installed.
+- It assumes the existence of the `build_row` function for processing match data.
 
 Usage:
 - Run the script from the command line and provide the match week number as an argument:
     `python epl_matchweek_result.py - mw < match_week_number >`
 
 Notes:
-- The script uses BeautifulSoup to parse HTML content and extract match fixtures and referee
+- The script uses selectolax to parse HTML content and extract match fixtures and referee
     information.
 - It sends HTTP requests to the Premier League website and an API endpoint to fetch match
     data.
@@ -46,64 +53,243 @@ Notes:
     internal match week numbering system."""
 
 import argparse
-import csv
-import json
-from urllib.request import Request, urlopen
+import asyncio
+import functools
+import random
+from pathlib import Path
+
+from epl_match_result import build_row
+
+try:  # both parsers accept the raw response bytes
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+# Number of random user agents sampled up front
+UA_POOL_SIZE = 32
+
+# Maximum number of simultaneous connections per session
+CONNECTION_LIMIT = 20
+
+# Default headers of the pulselive stats API session
+API_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 6.3; WOW64) AppleWebKit/537.36 \
+        (KHTML, like Gecko) Chrome/73.0.3683.75 Safari/537.36",
+    "Origin": "https://www.premierleague.com",
+    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+    "Referer": "https://www.premierleague.com//clubs/1/Arsenal/squad?se=79",
+}
+
+# On-disk cache of the stats API payloads of completed matches, keyed by match id
+CACHE_DIR = Path("EPL/cache")
+
+# Elements whose class list contains mc-summary__info
+SUMMARY_INFO_XPATH = (
+    '//*[contains(concat(" ", normalize-space(@class), " "), " mc-summary__info ")]'
+)
+
+# Buffer size of the CSV output file
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Line terminator of the CSV output, the same as csv.writer's default
+LINE_TERMINATOR = "\r\n"
+
+# Characters that require a CSV field to be quoted
+_QUOTED_CHARS = ',"\r\n'
+
+# CSV columns, in row order
+FIELDS = [
+    "Season",
+    "Date",
+    "HomeTeam",
+    "AwayTeam",
+    "FTHG",
+    "FTAG",
+    "HTHG",
+    "HTAG",
+    "Referee",
+    "HS",
+    "AS",
+    "HST",
+    "AST",
+    "HC",
+    "AC",
+    "HF",
+    "AF",
+    "HY",
+    "AY",
+    "HR",
+    "AR",
+]
+
+# Position of the only free-text column
+REFEREE_COLUMN = FIELDS.index("Referee")
+
+
+# The loaders below import the heavy dependencies on first use only, so that parsing the
+# command line (e.g. --help) does not pay their import cost
+@functools.cache
+def get_html_parser():
+    """Returns selectolax's LexborHTMLParser, or None when selectolax is not installed and
+    the lxml fallback is used."""
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        return None
+    return LexborHTMLParser
+
+
+@functools.cache
+def get_lxml_tools():
+    """Returns the lxml fallback's (etree, utf-8 HTML parser, summary info XPath).
+    The pages are fed as raw bytes, which lxml would otherwise guess as latin-1, and the
+    XPath is compiled once and shared by every match page."""
+    import lxml.html
+    from lxml import etree
+
+    return (
+        etree,
+        lxml.html.HTMLParser(encoding="utf-8"),
+        etree.XPath(SUMMARY_INFO_XPATH),
+    )
+
+
+@functools.cache
+def get_ua_pool():
+    """Returns random user agents sampled once, so requests skip the library lookup."""
+    from fake_useragent import UserAgent
 
-from bs4 import BeautifulSoup
-from epl_match_result import MatchStatistic
-from fake_useragent import UserAgent
+    ua = UserAgent()
+    return tuple(ua.random for _ in range(UA_POOL_SIZE))
+
+
+def parse_fixture_hrefs(html: bytes):
+    """Returns the match paths of the fixtures listed on a match week page.
+    Without selectolax the page goes through lxml's pull parser, which reports only the <a>
+    elements, and every link is cleared as soon as it has been inspected.
+    Args:
+        html(bytes): The raw match week page.
+    Returns:
+        list[str]: The href of each `a.match-fixture--abridged` link, in page order."""
+    html_parser = get_html_parser()
+    if html_parser is not None:
+        return [
+            node.attributes["href"]
+            for node in html_parser(html).css("a.match-fixture--abridged")
+        ]
 
-# Initialize User Agent
-ua = UserAgent()
+    etree, _, _ = get_lxml_tools()
+    hrefs = []
+    pull_parser = etree.HTMLPullParser(events=("end",), tag="a", encoding="utf-8")
+    pull_parser.feed(html)
+    pull_parser.close()
+    for _, elem in pull_parser.read_events():
+        if "match-fixture--abridged" in elem.get("class", "").split():
+            hrefs.append(elem.get("href"))
+        elem.clear()
+    return hrefs
 
-# Initialize parser
-parser = argparse.ArgumentParser()
 
-# Adding optional argument
-parser.add_argument("-mw", "--match_week", help="match_week")
+def parse_referee(html: bytes):
+    """Returns the referee's name from the last `.mc-summary__info` block of a match page.
+    Args:
+        html(bytes): The raw match page.
+    Returns:
+        str: The referee's name, without its "Referee: " label."""
+    html_parser = get_html_parser()
+    if html_parser is not None:
+        info = html_parser(html).css(".mc-summary__info")[-1].text()
+    else:
+        etree, utf8_html_parser, summary_info_xpath = get_lxml_tools()
+        tree = etree.fromstring(html, utf8_html_parser)
+        info = summary_info_xpath(tree)[-1].text_content()
+    return info.strip().rpartition(": ")[2]
+
+
+def _quote(value: str):
+    """Quotes a CSV field the way csv.QUOTE_MINIMAL does, only when it needs it."""
+    if any(char in value for char in _QUOTED_CHARS):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def _format_line(row: list):
+    """Joins a `build_row` row into one CSV line. The referee is the only free-text field,
+    so it is the only one quoted, and None is written as an empty field like csv.writer."""
+    fields = ["" if value is None else str(value) for value in row]
+    fields[REFEREE_COLUMN] = _quote(fields[REFEREE_COLUMN])
+    return ",".join(fields) + LINE_TERMINATOR
+
+
+async def fetch(session, url: str, headers: dict = None):
+    """Sends a GET request through `session` and returns the response body.
+    Args:
+        session(aiohttp.ClientSession): The session whose connection pool is used.
+        url(str): The requested URL.
+        headers(dict): Extra headers of this request.
+    Returns:
+        bytes: The response body.
+    Raises:
+        aiohttp.ClientResponseError: If the response status is an error."""
+    async with session.get(url, headers=headers) as response:
+        response.raise_for_status()
+        return await response.read()
+
+
+async def load_match_info(href: str, api_session):
+    """Returns the pulselive statistics JSON of a match, reading it from `CACHE_DIR` when
+    it has been fetched before. Only completed matches are cached since their data no
+    longer changes.
+    Args:
+        href(str): The match path taken from the match week fixtures, e.g. "/match/93321".
+        api_session(aiohttp.ClientSession): The pulselive API session.
+    Returns:
+        dict: The decoded statistics payload."""
+    cache_file = CACHE_DIR / f"{href.rstrip('/').rsplit('/', 1)[-1]}.json"
+    if cache_file.exists():
+        return json_loads(cache_file.read_bytes())
+
+    content = await fetch(
+        api_session, f"https://footballapi.pulselive.com/football/stats{href}"
+    )
+    match_info = json_loads(content)
 
-# Read arguments from command line
-args = parser.parse_args()
+    if match_info["entity"].get("status") == "C":
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # write then rename so an interrupted run never leaves a truncated entry
+        tmp_file = cache_file.with_suffix(".tmp")
+        tmp_file.write_bytes(content)
+        tmp_file.replace(cache_file)
+    return match_info
 
 
-def manipulate_stats(data: MatchStatistic, ref: str):
-    """Manipulates the match statistics data to extract relevant information.
+async def process_match(href: str, site_session, api_session):
+    """Fetches the referee and statistics of a single match and returns its CSV row.
     Args:
-        data(MatchStatistic): An instance of MatchStatistic containing match data.
-        ref(str): The referee's name."""
-    return [
-        data.match.season,
-        data.match.kickoff,
-        data.team1.info.short_name,
-        data.team2.info.short_name,
-        data.team1.stats.ftg,
-        data.team2.stats.ftg,
-        data.team1.stats.htg,
-        data.team2.stats.htg,
-        ref,
-        data.team1.stats.sh,
-        data.team2.stats.sh,
-        data.team1.stats.sot,
-        data.team2.stats.sot,
-        data.team1.stats.co,
-        data.team2.stats.co,
-        data.team1.stats.fo,
-        data.team2.stats.fo,
-        data.team1.stats.yc,
-        data.team2.stats.yc,
-        data.team1.stats.rc,
-        data.team2.stats.rc,
-    ]
-
-
-def main(match_week):
+        href(str): The match path taken from the match week fixtures, e.g. "/match/93321".
+        site_session(aiohttp.ClientSession): The premierleague.com session.
+        api_session(aiohttp.ClientSession): The pulselive API session.
+    Returns:
+        list: The row produced by `build_row` for the match."""
+    content = await fetch(
+        site_session,
+        f"https://www.premierleague.com{href}",
+        headers={"User-Agent": random.choice(get_ua_pool())},
+    )
+    ref = parse_referee(content)
+
+    match_info = await load_match_info(href, api_session)
+
+    return build_row(match_info, ref)
+
+
+async def main(match_week):
     """
     Fetches and processes match statistics for a given Premier League match week.
 
     This function retrieves match statistics from the Premier League website for a
-    specified match week and writes the data to a CSV file. It uses BeautifulSoup to
-    parse HTML content and extract relevant data, and urllib to handle HTTP requests
+    specified match week and writes the data to a CSV file. It uses selectolax to
+    parse HTML content and extract relevant data, and aiohttp sessions to handle HTTP requests
     and responses. Additionally, it employs fake_useragent to generate random user
     agents for the requests.
 
@@ -112,8 +298,8 @@ def main(match_week):
 
     Functionality:
     - Constructs the URL for the specified match week and fetches the match fixtures.
-    - Extracts match IDs from the fixtures and iterates through each match to fetch
-      detailed statistics.
+    - Extracts match IDs from the fixtures and fetches each match's detailed statistics
+      concurrently with `process_match` on a single event loop.
     - Retrieves various match statistics such as season, date, teams, goals, referee,
       shots, cards, etc.
     - Writes the extracted statistics to a CSV file named `match_stats_ < match_week > .csv`
@@ -124,101 +310,57 @@ def main(match_week):
       AST, HC, AC, HF, AF, HY, AY, HR, AR.
 
     Dependencies:
-    - urllib: For sending HTTP requests and handling responses.
-    - BeautifulSoup: For parsing HTML content.
+    - aiohttp: For sending HTTP requests and handling responses.
+    - selectolax (or lxml): For parsing HTML content.
     - fake_useragent: For generating random user agents.
-    - json: For processing JSON responses.
+    - orjson (or json): For processing JSON responses.
 
     Note:
-    - The function assumes the existence of helper functions `MatchStatistic.get_stats`
-      and `manipulate_stats` to process and format the match statistics.
-    - The function is intended to be called from the main block with the match week as
-      an argument.
+    - The function assumes the existence of the helper function `build_row` to format
+      the match statistics.
+    - The coroutine is intended to be run from the main block with `asyncio.run` and the
+      match week as an argument.
     """
-    match_week_req = Request(
-        f"https://www.premierleague.com/matchweek/{match_week}/blog?match=true"
-    )
-    match_week_req.add_header("User-Agent", ua.random)
-    with urlopen(match_week_req) as match_week_doc:
-        match_id_list = list(
-            m.attrs["href"]
-            for m in BeautifulSoup(
-                match_week_doc.read().decode("utf8"), "html.parser"
-            ).select("a.match-fixture--abridged")
+    import aiohttp
+
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=CONNECTION_LIMIT)
+    ) as site_session, aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=CONNECTION_LIMIT), headers=API_HEADERS
+    ) as api_session:
+        content = await fetch(
+            site_session,
+            f"https://www.premierleague.com/matchweek/{match_week}/blog?match=true",
+            headers={"User-Agent": random.choice(get_ua_pool())},
         )
+        match_id_list = parse_fixture_hrefs(content)
 
-        filename = f"EPL/data/match_stats_{match_week}.csv"
-        fields = [
-            "Season",
-            "Date",
-            "HomeTeam",
-            "AwayTeam",
-            "FTHG",
-            "FTAG",
-            "HTHG",
-            "HTAG",
-            "Referee",
-            "HS",
-            "AS",
-            "HST",
-            "AST",
-            "HC",
-            "AC",
-            "HF",
-            "AF",
-            "HY",
-            "AY",
-            "HR",
-            "AR",
-        ]
+        # fetching every match concurrently, rows come back in fixture order
+        rows = await asyncio.gather(
+            *(process_match(href, site_session, api_session) for href in match_id_list)
+        )
+
+    filename = f"EPL/data/match_stats_{match_week}.csv"
 
-        # writing to csv file
-        with open(filename, "w", encoding="utf-8") as csvfile:
-            # creating a csv dict writer object
-            writer = csv.writer(csvfile, delimiter=",")
-            writer.writerow(fields)
-
-            # writing data rows
-
-            for i in match_id_list:
-                match_stat_req = Request(f"https://www.premierleague.com{i}")
-                match_stat_req.add_header("User-Agent", ua.random)
-                with urlopen(match_stat_req) as uo:
-                    ref = list(
-                        t.text.strip()
-                        for t in BeautifulSoup(
-                            uo.read().decode("utf8"), "html.parser"
-                        ).find_all(class_="mc-summary__info")
-                    )[-1].split(": ")[-1]
-
-                    match_stat_req = Request(
-                        f"https://footballapi.pulselive.com/football/stats{i}"
-                    )
-                    match_stat_req.add_header(
-                        "User-Agent",
-                        "Mozilla/5.0 (Windows NT 6.3; WOW64) AppleWebKit/537.36 \
-                        (KHTML, like Gecko) Chrome/73.0.3683.75 Safari/537.36",
-                    )
-                    match_stat_req.add_header(
-                        "Origin", "https://www.premierleague.com")
-                    match_stat_req.add_header(
-                        "Content-Type",
-                        "application/x-www-form-urlencoded; charset=UTF-8",
-                    )
-                    match_stat_req.add_header(
-                        "Referer",
-                        "https://www.premierleague.com//clubs/1/Arsenal/squad?se=79",
-                    )
-                    with urlopen(match_stat_req) as sub_uo:
-                        match_info = json.loads(sub_uo.read().decode("utf8"))
-
-                        match_stats = MatchStatistic(match_info)
-                        match_stats.get_stats(match_info)
-
-                        writer.writerow(manipulate_stats(match_stats, ref))
+    # writing to csv file, the whole batch goes out through one large buffer
+    with open(
+        filename, "w", encoding="utf-8", newline="", buffering=WRITE_BUFFER_SIZE
+    ) as csvfile:
+        csvfile.write(
+            ",".join(FIELDS) + LINE_TERMINATOR + "".join(map(_format_line, rows))
+        )
 
 
 if __name__ == "__main__":
+    # Initialize parser
+    parser = argparse.ArgumentParser()
+
+    # Adding optional argument
+    parser.add_argument("-mw", "--match_week", help="match_week")
+
+    # Read arguments from command line
+    args = parser.parse_args()
+
     matchWeek = int(args.match_week)
-    main(matchWeek + 18389)
+    asyncio.run(main(matchWeek + 18389))
     print("Finish!")